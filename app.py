@@ -1,11 +1,16 @@
 import glob
+import hashlib
+import io
 import os
 import re
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import plotly.io as pio
 
 # ----------------------------
@@ -20,6 +25,46 @@ st.set_page_config(
 pio.templates.default = "plotly_dark"
 
 DATA_DIR = "data"
+CACHE_PREFIX = "_cache_"
+CACHE_VERSION = 7  # bump when the cached frame's schema/dtypes change
+
+# The per-widget-state aggregates cache keeps only the most recent combinations
+AGG_CACHE_ENTRIES = 24
+
+# Line charts longer than LTTB_TRIGGER points are downsampled to LTTB_POINTS
+LTTB_POINTS = 500
+LTTB_TRIGGER = 1000
+
+
+# Normalized column alias -> canonical column name
+CANON = {
+    "position": "Position",
+    "rank": "Position",
+    "chart position": "Position",
+    "track name": "Track",
+    "track": "Track",
+    "trackname": "Track",
+    "song": "Track",
+    "title": "Track",
+    "artist": "Artist",
+    "artist name": "Artist",
+    "artist names": "Artist",
+    "artistname": "Artist",
+    "artistnames": "Artist",
+    "streams": "Streams",
+    "stream": "Streams",
+    "url": "URL",
+    "track url": "URL",
+    "spotify url": "URL",
+    "uri": "URI",
+}
+
+# Canonical columns read as Arrow strings
+STRING_COLS = {"Track", "Artist", "URL", "URI"}
+
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_URI_RE = re.compile(r"^spotify:track:([A-Za-z0-9]+)")
+_WS_RE = re.compile(r"[_\s]+")
 
 
 # ----------------------------
@@ -27,102 +72,278 @@ DATA_DIR = "data"
 # ----------------------------
 def extract_date_from_filename(path: str):
     name = os.path.basename(path)
-    m = re.search(r"(\d{4}-\d{2}-\d{2})", name)
+    m = _DATE_RE.search(name)
     if not m:
         return None
-    return pd.to_datetime(m.group(1), errors="coerce")
+    try:
+        return dt.date.fromisoformat(m.group(1))
+    except ValueError:
+        return None
 
 
 def normalize_col(c: str) -> str:
-    c = str(c).strip().lower()
-    c = re.sub(r"[_\s]+", " ", c)
-    return c
+    return _WS_RE.sub(" ", str(c).strip().lower())
+
+
+def parquet_cache_path(files: list) -> str:
+    # Key on file names + mtimes so any added/edited CSV invalidates the cache
+    stamp = (CACHE_VERSION, sorted((f, os.path.getmtime(f)) for f in files))
+    key = hashlib.md5(repr(stamp).encode()).hexdigest()
+    return os.path.join(DATA_DIR, f"{CACHE_PREFIX}{key}.parquet")
 
 
-def uri_to_url(uri: str) -> str:
-    if not isinstance(uri, str):
-        return ""
-    uri = uri.strip()
-    m = re.match(r"spotify:track:([A-Za-z0-9]+)", uri)
-    if m:
-        return f"https://open.spotify.com/track/{m.group(1)}"
-    return ""
+# One daily CSV -> normalized frame (None if unusable). Runs in worker threads.
+def parse_chart_csv(f: str):
+    d = extract_date_from_filename(f)
+    if d is None:
+        return None
+
+    # Peek at the header to map this file's column names onto the canonical ones
+    try:
+        header = pd.read_csv(f, nrows=0).columns
+    except Exception:
+        return None
+
+    rename_map = {}
+    for c in header:
+        norm = normalize_col(c)
+        if norm in CANON:
+            rename_map[c] = CANON[norm]
+
+    # Must have these
+    if "Position" not in rename_map.values() or "Streams" not in rename_map.values():
+        return None
+
+    # Read only the mapped columns; text columns come back Arrow-backed (no Python objects)
+    dtypes = {c: "string[pyarrow]" for c, canon in rename_map.items() if canon in STRING_COLS}
+    try:
+        df = pd.read_csv(f, engine="pyarrow", usecols=list(rename_map), dtype=dtypes)
+    except Exception:
+        return None
+
+    df = df.rename(columns=rename_map)
+
+    # Create URL from URI if URL missing
+    if "URL" not in df.columns:
+        if "URI" in df.columns:
+            ids = df["URI"].astype(str).str.strip().str.extract(_URI_RE, expand=False)
+            df["URL"] = ("https://open.spotify.com/track/" + ids).fillna("")
+        else:
+            df["URL"] = ""
+
+    if "Track" not in df.columns:
+        df["Track"] = "Unknown"
+    if "Artist" not in df.columns:
+        df["Artist"] = "Unknown"
+
+    df["Position"] = pd.to_numeric(df["Position"], errors="coerce")
+    df["Streams"] = pd.to_numeric(df["Streams"], errors="coerce")
+    df["Date"] = np.datetime64(d, "ns")
+
+    df = df.dropna(subset=["Position", "Streams"])
+
+    # Ranks fit in int16 and per-day stream counts in int32 (sums still come back as int64).
+    # Drop out-of-range rows first: astype would silently wrap them.
+    df = df[
+        df["Position"].between(0, np.iinfo(np.int16).max)
+        & df["Streams"].between(0, np.iinfo(np.int32).max)
+    ].copy()
+    df["Position"] = df["Position"].astype("int16")
+    df["Streams"] = df["Streams"].astype("int32")
+    return df
 
 
 @st.cache_data(ttl=3600)
-def load_local_data() -> pd.DataFrame:
+def load_local_data() -> tuple[pd.DataFrame, list]:
+    # Returns (frame, sorted artist names) so the sidebar doesn't re-derive options each rerun
     files = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
     if not files:
-        return pd.DataFrame()
-
-    all_days = []
-
-    for f in files:
-        d = extract_date_from_filename(f)
-        if d is None or pd.isna(d):
-            continue
+        return pd.DataFrame(), []
 
+    cache_path = parquet_cache_path(files)
+    if os.path.exists(cache_path):
         try:
-            df = pd.read_csv(f)
+            out = pd.read_parquet(cache_path)
+            return out, sorted(out["Artist"].dropna().unique().tolist())
         except Exception:
-            continue
-
-        df.columns = [str(c).strip() for c in df.columns]
-
-        rename_map = {}
-        for c in df.columns:
-            cl = normalize_col(c)
-
-            if cl in ["position", "rank", "chart position"]:
-                rename_map[c] = "Position"
-            elif cl in ["track name", "track", "trackname", "song", "title"]:
-                rename_map[c] = "Track"
-            elif cl in ["artist", "artist name", "artist names", "artistname", "artistnames"]:
-                rename_map[c] = "Artist"
-            elif cl in ["streams", "stream"]:
-                rename_map[c] = "Streams"
-            elif cl in ["url", "track url", "spotify url"]:
-                rename_map[c] = "URL"
-            elif cl in ["uri"]:
-                rename_map[c] = "URI"
-
-        df = df.rename(columns=rename_map)
-
-        # Create URL from URI if URL missing
-        if "URL" not in df.columns:
-            if "URI" in df.columns:
-                df["URL"] = df["URI"].map(uri_to_url)
-            else:
-                df["URL"] = ""
-
-        # Must have these
-        if "Position" not in df.columns or "Streams" not in df.columns:
-            continue
-
-        if "Track" not in df.columns:
-            df["Track"] = "Unknown"
-        if "Artist" not in df.columns:
-            df["Artist"] = "Unknown"
-
-        df["Position"] = pd.to_numeric(df["Position"], errors="coerce")
-        df["Streams"] = pd.to_numeric(df["Streams"], errors="coerce")
-        df["Date"] = d
-
-        df = df.dropna(subset=["Position", "Streams"])
-        all_days.append(df)
+            pass
+
+    with ThreadPoolExecutor() as ex:
+        all_days = [d for d in ex.map(parse_chart_csv, files) if d is not None]
 
     if not all_days:
-        return pd.DataFrame()
+        return pd.DataFrame(), []
 
     out = pd.concat(all_days, ignore_index=True)
 
     keep = [c for c in ["Date", "Position", "Track", "Artist", "Streams", "URL"] if c in out.columns]
-    out = out[keep].copy()
-    out["Track"] = out["Track"].astype(str)
-    out["Artist"] = out["Artist"].astype(str)
+    # Date-sorted (stable, keeps chart order within a day) so range filters can binary-search
+    out = out[keep].sort_values("Date", kind="stable").reset_index(drop=True)
+    # Categoricals: each distinct name stored once, groupbys run on the int codes
+    # Missing names get the same placeholder as a missing column (Arrow NA would stringify to "<NA>")
+    out["Track"] = out["Track"].fillna("Unknown").astype(str).astype("category")
+    out["Artist"] = out["Artist"].fillna("Unknown").astype(str).astype("category")
+
+    # Upper-cased search keys (hidden from the table) so searches skip case folding
+    out["_Track_U"] = out["Track"].str.upper().astype("category")
+    out["_Artist_U"] = out["Artist"].str.upper().astype("category")
+
+    # Drop stale caches, then write the fresh one (best effort: read-only disks just skip it)
+    try:
+        for old in glob.glob(os.path.join(DATA_DIR, f"{CACHE_PREFIX}*.parquet")):
+            os.remove(old)
+        out.to_parquet(cache_path, compression="zstd", index=False)
+    except Exception:
+        pass
+    return out, sorted(out["Artist"].dropna().unique().tolist())
+
+
+# Not cached: a searchsorted slice + one mask is cheaper than hashing df and unpickling a copy
+def apply_filters(
+    df: pd.DataFrame,
+    start_date: dt.date,
+    end_date: dt.date,
+    rank_max: int,
+    artist_choice: str,
+    keyword: str,
+) -> pd.DataFrame:
+    # Compare on the datetime64 column directly (end is inclusive of the whole day)
+    ts_start = pd.Timestamp(start_date)
+    ts_end = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+
+    # df is sorted by Date: slice the window by binary search, then mask only that slice
+    lo = df["Date"].searchsorted(ts_start, side="left")
+    hi = df["Date"].searchsorted(ts_end, side="right")
+    window = df.iloc[lo:hi]
+
+    mask = window["Position"] <= rank_max
+
+    if artist_choice != "(All)":
+        mask &= window["Artist"] == artist_choice
+
+    if keyword:
+        mask &= window["_Track_U"].str.contains(keyword.upper(), regex=False, na=False)
+
+    return window.loc[mask]
+
+
+def top_by_category(df: pd.DataFrame, cat_col: str, val_col: str, n: int = 10) -> pd.DataFrame:
+    # Sum val_col per category straight off the integer codes (no groupby hash table)
+    c = df[cat_col].cat.remove_unused_categories()
+    totals = np.bincount(c.cat.codes.to_numpy(), weights=df[val_col].to_numpy(np.float64))
+    if n < len(totals):
+        idx = np.argpartition(-totals, n)[:n]
+    else:
+        idx = np.arange(len(totals))
+    idx = idx[np.argsort(-totals[idx], kind="stable")]
+    return pd.DataFrame({cat_col: c.cat.categories[idx], "total_streams": totals[idx].astype(np.int64)})
+
+
+@st.cache_data(ttl=3600, max_entries=AGG_CACHE_ENTRIES)
+def compute_aggregates(df_f: pd.DataFrame):
+    # Everything derived from the filtered window, so reruns that only touch
+    # the drilldown/table widgets skip all of these groupbys
+    daily = (
+        df_f.groupby("Date", as_index=False, observed=True)
+        .agg(
+            total_streams=("Streams", "sum"),
+            avg_streams=("Streams", "mean"),
+            tracks_count=("Track", "nunique"),
+        )
+        .sort_values("Date")
+    )
+
+    top_tracks = top_by_category(df_f, "Track", "Streams")
+    top_artists = top_by_category(df_f, "Artist", "Streams")
+
+    # One sort, then a per-track diff: + means the track climbed since its previous day
+    tmp = df_f.sort_values(["Track", "Date"])
+    tmp["rank_change"] = -tmp.groupby("Track", observed=True)["Position"].diff()
+
+    movers = (
+        tmp.dropna(subset=["rank_change"])
+        .groupby(["Track", "Artist"], observed=True)["rank_change"]
+        .agg(best_improvement="max", worst_drop="min")
+        .reset_index()
+        .nlargest(10, "best_improvement")
+    )
+    movers["best_improvement"] = movers["best_improvement"].round().astype("int32")
+    movers["worst_drop"] = movers["worst_drop"].round().astype("int32")
+
+    # Most streamed tracks overall in current selection
+    highlights = (
+        df_f.groupby(["Track", "Artist"], as_index=False, observed=True)
+        .agg(total_streams=("Streams", "sum"), best_rank=("Position", "min"))
+        .sort_values(["total_streams", "best_rank"], ascending=[False, True])
+        .head(10)
+    )
+    highlights["total_streams"] = highlights["total_streams"].round(0).astype(int)
+
+    # Per-track row positions (df_f is already Date-sorted), so the drilldown is a
+    # dict lookup instead of a scan; small int arrays keep the cached value cheap to unpickle
+    track_idx = df_f.groupby("Track", observed=True).indices
+
+    return daily, top_tracks, top_artists, movers, highlights, track_idx
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: keep first/last point, then per bucket the
+    # point forming the largest triangle with the previous pick and next bucket's mean
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        out[i + 1] = prev
     return out
 
 
+def downsample_lttb(df: pd.DataFrame, x: str, y: str, n: int = LTTB_POINTS) -> pd.DataFrame:
+    if len(df) <= LTTB_TRIGGER:
+        return df
+    xs = df[x].astype("int64").to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    return df.iloc[lttb_indices(xs, ys, n)]
+
+
+def line_chart(
+    df: pd.DataFrame, x: str, y: str, title: str, y_fmt: str = "", uirevision: str | None = None
+) -> go.Figure:
+    # WebGL line trace: one draw call instead of an SVG node per point
+    df = downsample_lttb(df, x, y)
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scattergl(
+            x=df[x],
+            y=df[y],
+            mode="lines+markers",
+            name=y,
+            hovertemplate=f"{x}=%{{x}}<br>{y}=%{{y{y_fmt}}}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title=x,
+        yaxis_title=y,
+        margin=dict(l=10, r=10, t=60, b=10),
+        title_font_size=18,
+        # Zoom/pan survive reruns while uirevision is unchanged; a new value resets them
+        uirevision=uirevision,
+    )
+    return fig
+
+
 # ----------------------------
 # UI polish (CSS)
 # ----------------------------
@@ -170,7 +391,7 @@ hr { opacity: 0.25; }
 # ----------------------------
 # Load data
 # ----------------------------
-df = load_local_data()
+df, artist_list = load_local_data()
 
 # Hero header
 st.markdown(
@@ -230,21 +451,17 @@ else:
 rank_max = st.sidebar.slider("Include ranks up to (Top N)", 10, 200, 50)
 
 st.sidebar.subheader("Filters")
-artist_options = ["(All)"] + sorted(df["Artist"].dropna().unique().tolist())
+artist_options = ["(All)"] + artist_list
 artist_choice = st.sidebar.selectbox("Artist", artist_options)
 keyword = st.sidebar.text_input("Track keyword", value="")
 
 # ----------------------------
 # Apply filters
 # ----------------------------
-df_f = df[(df["Date"].dt.date >= start_date) & (df["Date"].dt.date <= end_date)].copy()
-df_f = df_f[df_f["Position"] <= rank_max].copy()
+df_f = apply_filters(df, start_date, end_date, rank_max, artist_choice, keyword.strip())
 
-if artist_choice != "(All)":
-    df_f = df_f[df_f["Artist"] == artist_choice]
-
-if keyword.strip():
-    df_f = df_f[df_f["Track"].fillna("").str.contains(keyword.strip(), case=False, na=False)]
+# Chart uirevision for the window-level charts: keep zoom until the filters change
+view_rev = f"{start_date}|{end_date}|{rank_max}|{artist_choice}|{keyword.strip()}"
 
 if df_f.empty:
     st.warning("No rows match your filters. Try widening date range or Top N.")
@@ -266,67 +483,32 @@ with st.container():
 # ----------------------------
 # Section: Trends + Top entities
 # ----------------------------
+daily, top_tracks, top_artists, movers, highlights, track_idx = compute_aggregates(df_f)
+
 st.markdown('<div class="section">', unsafe_allow_html=True)
 left, right = st.columns([1.25, 0.75], gap="large")
 
 with left:
     st.subheader("📈 Temporal Trends")
 
-
-    daily = (
-        df_f.groupby("Date", as_index=False)
-        .agg(
-            total_streams=("Streams", "sum"),
-            avg_streams=("Streams", "mean"),
-            tracks_count=("Track", "nunique"),
-        )
-        .sort_values("Date")
+    fig_total = line_chart(
+        daily, "Date", "total_streams", "Total Streams per Day", y_fmt=":,", uirevision=view_rev
     )
+    st.plotly_chart(fig_total, use_container_width=True, key="trend_total")
 
-    fig_total = px.line(
-        daily,
-        x="Date",
-        y="total_streams",
-        markers=True,
-        title="Total Streams per Day",
-        hover_data={"Date": True, "total_streams": ":,"},
-    )
-    fig_total.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_total, use_container_width=True)
-
-    fig_tracks = px.line(
-        daily,
-        x="Date",
-        y="tracks_count",
-        markers=True,
-        title="Unique Tracks per Day",
-        hover_data={"Date": True, "tracks_count": True},
-    )
-    fig_tracks.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_tracks, use_container_width=True)
+    fig_tracks = line_chart(daily, "Date", "tracks_count", "Unique Tracks per Day", uirevision=view_rev)
+    st.plotly_chart(fig_tracks, use_container_width=True, key="trend_tracks")
 
 with right:
     st.subheader("🏆 Top Entities")
 
-    top_tracks = (
-        df_f.groupby("Track", as_index=False)
-        .agg(total_streams=("Streams", "sum"))
-        .sort_values("total_streams", ascending=False)
-        .head(10)
-    )
     fig_tt = px.bar(top_tracks, x="total_streams", y="Track", orientation="h", title="Top 10 Tracks")
-    fig_tt.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_tt, use_container_width=True)
+    fig_tt.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18, uirevision=view_rev)
+    st.plotly_chart(fig_tt, use_container_width=True, key="top_tracks")
 
-    top_artists = (
-        df_f.groupby("Artist", as_index=False)
-        .agg(total_streams=("Streams", "sum"))
-        .sort_values("total_streams", ascending=False)
-        .head(10)
-    )
     fig_ta = px.bar(top_artists, x="total_streams", y="Artist", orientation="h", title="Top 10 Artists")
-    fig_ta.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_ta, use_container_width=True)
+    fig_ta.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18, uirevision=view_rev)
+    st.plotly_chart(fig_ta, use_container_width=True, key="top_artists")
 
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -339,33 +521,10 @@ st.subheader("🚀 Movers & Highlights")
 c1, c2 = st.columns([1, 1], gap="large")
 
 with c1:
-    tmp = df_f.sort_values("Date").copy()
-    tmp["prev_rank"] = tmp.groupby("Track")["Position"].shift(1)
-    tmp["rank_change"] = tmp["prev_rank"] - tmp["Position"]  # + means improved
-
-    movers = (
-        tmp.dropna(subset=["rank_change"])
-        .groupby(["Track", "Artist"], as_index=False)
-        .agg(best_improvement=("rank_change", "max"), worst_drop=("rank_change", "min"))
-        .sort_values("best_improvement", ascending=False)
-        .head(10)
-    )
-    movers["best_improvement"] = movers["best_improvement"].round(0).astype(int)
-    movers["worst_drop"] = movers["worst_drop"].round(0).astype(int)
-
     st.caption("Biggest rank improvements (higher = better).")
     st.dataframe(movers, use_container_width=True, hide_index=True)
 
 with c2:
-    # Most streamed tracks overall in current selection
-    highlights = (
-        df_f.groupby(["Track", "Artist"], as_index=False)
-        .agg(total_streams=("Streams", "sum"), best_rank=("Position", "min"))
-        .sort_values(["total_streams", "best_rank"], ascending=[False, True])
-        .head(10)
-    )
-    highlights["total_streams"] = highlights["total_streams"].round(0).astype(int)
-
     st.caption("Most total streams in the selected window.")
     st.dataframe(highlights, use_container_width=True, hide_index=True)
 
@@ -377,23 +536,31 @@ st.markdown("</div>", unsafe_allow_html=True)
 st.markdown('<div class="section">', unsafe_allow_html=True)
 st.subheader("🎛️ Track Drilldown")
 
-track_options = sorted(df_f["Track"].dropna().unique().tolist())
-chosen_track = st.selectbox("Pick a track", track_options)
 
-track_df = df_f[df_f["Track"] == chosen_track].sort_values("Date").copy()
+# Fragment: picking a track reruns only this block, not the filters/aggregates above
+@st.fragment
+def track_drilldown(df_f: pd.DataFrame, track_idx: dict):
+    # Categories are already sorted; drop the ones filtered out of this window
+    track_options = df_f["Track"].cat.remove_unused_categories().cat.categories.tolist()
+    chosen_track = st.selectbox("Pick a track", track_options)
+
+    track_df = df_f.iloc[track_idx.get(chosen_track, [])]
 
-colA, colB = st.columns([1, 1], gap="large")
+    colA, colB = st.columns([1, 1], gap="large")
 
-with colA:
-    fig_rank = px.line(track_df, x="Date", y="Position", markers=True, title="Rank over Time")
-    fig_rank.update_yaxes(autorange="reversed")
-    fig_rank.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_rank, use_container_width=True)
+    with colA:
+        fig_rank = line_chart(track_df, "Date", "Position", "Rank over Time", uirevision=chosen_track)
+        fig_rank.update_yaxes(autorange="reversed")
+        st.plotly_chart(fig_rank, use_container_width=True, key="drill_rank")
 
-with colB:
-    fig_streams = px.line(track_df, x="Date", y="Streams", markers=True, title="Streams over Time")
-    fig_streams.update_layout(margin=dict(l=10, r=10, t=60, b=10), title_font_size=18)
-    st.plotly_chart(fig_streams, use_container_width=True)
+    with colB:
+        fig_streams = line_chart(
+            track_df, "Date", "Streams", "Streams over Time", y_fmt=":,", uirevision=chosen_track
+        )
+        st.plotly_chart(fig_streams, use_container_width=True, key="drill_streams")
+
+
+track_drilldown(df_f, track_idx)
 
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -403,24 +570,46 @@ st.markdown("</div>", unsafe_allow_html=True)
 st.markdown('<div class="section">', unsafe_allow_html=True)
 st.subheader("📋 Data Table")
 
-q = st.text_input("Search in table (track or artist)", "")
-table_df = df_f.copy()
-if q.strip():
-    table_df = table_df[
-        table_df["Track"].str.contains(q, case=False, na=False)
-        | table_df["Artist"].str.contains(q, case=False, na=False)
-    ]
 
-table_df = table_df.sort_values(["Date", "Position"])
+# Fragment: typing in the table search reruns only the table and its exports
+@st.fragment
+def data_table(df_f: pd.DataFrame):
+    q = st.text_input("Search in table (track or artist)", "")
+    table_df = df_f
+    if q.strip():
+        q_up = q.strip().upper()
+        table_df = table_df[
+            table_df["_Track_U"].str.contains(q_up, regex=False, na=False)
+            | table_df["_Artist_U"].str.contains(q_up, regex=False, na=False)
+        ]
+
+    table_df = table_df.drop(columns=["_Track_U", "_Artist_U"]).sort_values(["Date", "Position"])
+
+    st.dataframe(table_df, use_container_width=True, hide_index=True)
+
+    # Write straight into a byte buffer (no intermediate str copy of the CSV)
+    csv_buf = io.BytesIO()
+    table_df.to_csv(csv_buf, index=False, encoding="utf-8")
+
+    d1, d2 = st.columns([1, 1])
+    d1.download_button(
+        "⬇️ Download filtered CSV",
+        data=csv_buf.getvalue(),
+        file_name="spotify_pk_filtered.csv",
+        mime="text/csv",
+    )
+    # Parquet is only built on request, so search keystrokes don't pay for a second export
+    if d2.toggle("Prepare Parquet download", value=False):
+        parquet_buf = io.BytesIO()
+        table_df.to_parquet(parquet_buf, index=False)
+        d2.download_button(
+            "⬇️ Download filtered Parquet",
+            data=parquet_buf.getvalue(),
+            file_name="spotify_pk_filtered.parquet",
+            mime="application/octet-stream",
+        )
 
-st.dataframe(table_df, use_container_width=True, hide_index=True)
 
-csv_bytes = table_df.to_csv(index=False).encode("utf-8")
-st.download_button(
-    "⬇️ Download filtered CSV",
-    data=csv_bytes,
-    file_name="spotify_pk_filtered.csv",
-    mime="text/csv",
-)
+data_table(df_f)
 
 st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file